@@ -3,14 +3,74 @@
 """Password encryption module"""
 
 import bcrypt
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "64"))
+HASH_TIMEOUT = float(os.getenv("HASH_TIMEOUT", "10"))
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS", "12")
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_SIZE)
+_rounds = None
+_rounds_lock = threading.Lock()
+
+
+def calibrate_rounds(target_ms: float = BCRYPT_TARGET_MS) -> int:
+    """Pick the highest cost whose hash time fits the target"""
+    rounds = BCRYPT_MIN_ROUNDS
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds))
+    elapsed = (time.perf_counter() - start) * 1000
+    while rounds < BCRYPT_MAX_ROUNDS and elapsed * 2 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    return rounds
+
+
+def get_rounds() -> int:
+    """Return the bcrypt cost, calibrating once when set to auto"""
+    global _rounds
+    if _rounds is None:
+        with _rounds_lock:
+            if _rounds is None:
+                if BCRYPT_ROUNDS == "auto":
+                    _rounds = calibrate_rounds()
+                else:
+                    _rounds = int(BCRYPT_ROUNDS)
+    return _rounds
+
+
+def _run(func: Callable, *args):
+    """Run a bcrypt job on the worker pool"""
+    if not _slots.acquire(timeout=HASH_TIMEOUT):
+        raise RuntimeError("hashing queue is full")
+    try:
+        future = _executor.submit(func, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=HASH_TIMEOUT)
+    except FutureTimeout:
+        raise RuntimeError("hashing timed out")
 
 
 def hash_password(password: str) -> bytes:
     """Hash given password"""
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password.encode('utf-8'), salt)
+    salt = bcrypt.gensalt(get_rounds())
+    return _run(bcrypt.hashpw, password.encode('utf-8'), salt)
 
 
 def is_valid(hashed_password: bytes, password: str) -> bool:
     """Validate given password"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+    return _run(bcrypt.checkpw, password.encode('utf-8'), hashed_password)
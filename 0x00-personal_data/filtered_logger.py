@@ -2,22 +2,59 @@
 
 """Personal data filter"""
 
+import atexit
+import queue
 import re
 import logging
+import logging.handlers
 import mysql.connector
 import os
-from typing import List, Tuple
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, List, Optional, Pattern, Tuple
 
 PII_FIELDS: Tuple[str, ...] = ("name", "email", "phone", "ssn", "password")
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_OVERFLOW = os.getenv("LOG_OVERFLOW", "block")
+DB_POOL_SIZE = int(os.getenv("PERSONAL_DATA_DB_POOL_SIZE", "5"))
+DB_CONNECT_TIMEOUT = int(os.getenv("PERSONAL_DATA_DB_CONNECT_TIMEOUT", "10"))
+DB_READ_TIMEOUT = os.getenv("PERSONAL_DATA_DB_READ_TIMEOUT")
+DB_CHECKOUT_TIMEOUT = float(os.getenv("PERSONAL_DATA_DB_CHECKOUT_TIMEOUT",
+                                      "30"))
+DB_CONNECT_RETRIES = int(os.getenv("PERSONAL_DATA_DB_CONNECT_RETRIES", "3"))
+IDENTIFIER = re.compile(r"^\w+$")
+
+
+@lru_cache(maxsize=128)
+def _redaction_pattern(fields: Tuple[str, ...], separator: str) -> Pattern:
+    """Compile one alternation pattern for all fields"""
+    names = "|".join(re.escape(field) for field in fields)
+    return re.compile(f"({names})=[^{re.escape(separator)}]*")
+
+
+def _redact(pattern: Pattern, redaction: str, message: str) -> str:
+    """Redact every field in a single pass"""
+    return pattern.sub(lambda match: f"{match.group(1)}={redaction}",
+                       message)
+
+
+def _format_row(names: Tuple[str, ...], row: tuple) -> str:
+    """Format a row as field=value pairs"""
+    return "".join(f"{field}={value}; "
+                   for field, value in zip(names, row)).rstrip()
 
 
 def filter_datum(fields: List[str], redaction: str,
                  message: str, separator: str) -> str:
     """log message"""
-    for field in fields:
-        pattern = f"(?<={field}=)[^{separator}]*"
-        message = re.sub(pattern, redaction, message)
-    return message
+    if not fields:
+        return message
+    pattern = _redaction_pattern(tuple(fields), separator)
+    return _redact(pattern, redaction, message)
 
 
 class RedactingFormatter(logging.Formatter):
@@ -31,12 +68,43 @@ class RedactingFormatter(logging.Formatter):
         """Initialize the formatter"""
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self._pattern = _redaction_pattern(tuple(fields), self.SEPARATOR)
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log records"""
         message = super().format(record)
-        return filter_datum(self.fields, self.REDACTION,
-                            message, self.SEPARATOR)
+        return _redact(self._pattern, self.REDACTION, message)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler with an overflow policy"""
+
+    OVERFLOW_POLICIES = ("block", "drop", "count")
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "block"):
+        """Initialize the handler"""
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow}")
+        super(BoundedQueueHandler, self).__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge arguments, leave formatting to the listener"""
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record according to the overflow policy"""
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow == "count":
+                self.dropped += 1
 
 
 def get_logger() -> logging.Logger:
@@ -44,12 +112,19 @@ def get_logger() -> logging.Logger:
     logger = logging.getLogger("user_data")
     logger.setLevel(logging.INFO)
     logger.propagate = False
+    for handler in logger.handlers:
+        if isinstance(handler, BoundedQueueHandler):
+            return logger
 
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
     stream_handler = logging.StreamHandler()
     formatter = RedactingFormatter(fields=PII_FIELDS)
     stream_handler.setFormatter(formatter)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
 
-    logger.addHandler(stream_handler)
+    logger.addHandler(BoundedQueueHandler(log_queue, LOG_OVERFLOW))
     return logger
 
 
@@ -59,30 +134,189 @@ def get_db() -> mysql.connector.connection.MySQLConnection:
     password = os.getenv("PERSONAL_DATA_DB_PASSWORD", "")
     host = os.getenv("PERSONAL_DATA_DB_HOST", "localhost")
     db_name = os.getenv("PERSONAL_DATA_DB_NAME")
+    timeouts = {"connection_timeout": DB_CONNECT_TIMEOUT}
+    if DB_READ_TIMEOUT:
+        timeouts["read_timeout"] = int(DB_READ_TIMEOUT)
 
     return mysql.connector.connect(
         user=username,
         password=password,
         host=host,
-        database=db_name
+        database=db_name,
+        **timeouts
     )
 
 
+def _is_healthy(connection) -> bool:
+    """Check a connection with a trivial query"""
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Bounded pool of reusable database connections"""
+
+    def __init__(self, connect: Callable = get_db,
+                 size: int = DB_POOL_SIZE,
+                 timeout: float = DB_CHECKOUT_TIMEOUT,
+                 retries: int = DB_CONNECT_RETRIES,
+                 backoff: float = 0.1):
+        """Initialize the pool"""
+        self._connect = connect
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._idle = queue.LifoQueue(size)
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _open(self):
+        """Open a new connection, retrying with backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                return self._connect()
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def _checkout(self):
+        """Return a healthy idle connection or a new one"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._open()
+            if _is_healthy(connection):
+                return connection
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a block"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("No database connection available")
+        try:
+            connection = self._checkout()
+            try:
+                yield connection
+            except Exception:
+                try:
+                    connection.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                self._idle.put_nowait(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pool = None
+
+
+def get_pool() -> ConnectionPool:
+    """Get shared connection pool"""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool()
+    return _pool
+
+
+def get_export_logger(capacity: int = EXPORT_BATCH_SIZE) -> logging.Logger:
+    """Get buffered logger for pre-redacted export lines, printed
+    under the user_data name like get_logger records"""
+    logger = logging.getLogger("user_data_export")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not logger.handlers:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter(
+            RedactingFormatter.FORMAT.replace("%(name)s", "user_data")))
+        logger.addHandler(logging.handlers.MemoryHandler(
+            capacity, flushLevel=logging.CRITICAL, target=stream_handler))
+    return logger
+
+
+def export_users(db, columns: Optional[List[str]] = None,
+                 batch_size: int = EXPORT_BATCH_SIZE,
+                 limit: Optional[int] = None,
+                 key: Optional[str] = None,
+                 after: Optional[str] = None) -> Iterator[List[str]]:
+    """Stream redacted user rows in batches"""
+    for name in (columns or []) + ([key] if key else []):
+        if not IDENTIFIER.match(name):
+            raise ValueError(f"Invalid column name: {name}")
+    query = "SELECT {} FROM users".format(", ".join(columns or ["*"]))
+    params = []
+    if key is not None and after is not None:
+        query += f" WHERE {key} > %s"
+        params.append(after)
+    if key is not None:
+        query += f" ORDER BY {key}"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    pattern = _redaction_pattern(PII_FIELDS, RedactingFormatter.SEPARATOR)
+    cursor = db.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        names = cursor.column_names
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [_redact(pattern, RedactingFormatter.REDACTION,
+                           _format_row(names, row)) for row in rows]
+    finally:
+        cursor.close()
+
+
 def main() -> None:
     """Display filtered data"""
+    columns = os.getenv("EXPORT_COLUMNS")
+    limit = os.getenv("EXPORT_LIMIT")
     db = get_db()
-    cursor = db.cursor()
-    cursor.execute("SELECT * FROM users;")
-
-    logger = get_logger()
+    logger = get_export_logger()
 
-    for row in cursor:
-        message = "; ".join(f"{field}={value}" for field, value in zip(
-            cursor.column_names, row))
-        logger.info(message)
+    count = 0
+    start = time.perf_counter()
+    try:
+        for batch in export_users(
+                db,
+                columns=columns.split(",") if columns else None,
+                limit=int(limit) if limit else None,
+                key=os.getenv("EXPORT_RESUME_KEY"),
+                after=os.getenv("EXPORT_RESUME_AFTER")):
+            for message in batch:
+                logger.info(message)
+            count += len(batch)
+    finally:
+        for handler in logger.handlers:
+            handler.flush()
+        db.close()
 
-    cursor.close()
-    db.close()
+    elapsed = time.perf_counter() - start
+    print(f"Exported {count} rows in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:.0f} rows/s)",
+          file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark of the per-record cost of PII redaction on long messages,
+single-pass compiled pattern against one re.sub per field
+"""
+import logging
+import os
+import re
+import timeit
+from typing import List
+from filtered_logger import PII_FIELDS, RedactingFormatter, filter_datum
+
+RECORDS = int(os.getenv("BENCH_RECORDS", "20000"))
+EXTRA_FIELDS = [int(count) for count in
+                os.getenv("BENCH_EXTRA_FIELDS", "0,20,100").split(",")]
+
+
+def filter_datum_per_field(fields: List[str], redaction: str,
+                           message: str, separator: str) -> str:
+    """Previous implementation: one pattern and scan per field"""
+    for field in fields:
+        pattern = f"(?<={field}=)[^{separator}]*"
+        message = re.sub(pattern, redaction, message)
+    return message
+
+
+def message(extra: int) -> str:
+    """Return a record with the PII fields and extra plain fields"""
+    parts = [f"{field}=value-of-{field}" for field in PII_FIELDS]
+    parts += [f"attribute{i}=some longer plain value {i}"
+              for i in range(extra)]
+    return ";".join(parts) + ";"
+
+
+def per_record_us(func, *args) -> float:
+    """Return the mean cost of one call in microseconds"""
+    return timeit.timeit(lambda: func(*args), number=RECORDS) / RECORDS * 1e6
+
+
+def main() -> None:
+    """Compare both implementations and the formatter by message size"""
+    fields = list(PII_FIELDS)
+    formatter = RedactingFormatter(fields=fields)
+    print(f"{'length':>6} {'per field':>10} {'single pass':>12} "
+          f"{'formatter':>10}  (us per record)")
+    for extra in EXTRA_FIELDS:
+        text = message(extra)
+        assert filter_datum(fields, "***", text, ";") == \
+            filter_datum_per_field(fields, "***", text, ";")
+        record = logging.LogRecord("user_data", logging.INFO, None, None,
+                                   text, None, None)
+        args = (fields, "***", text, ";")
+        old = per_record_us(filter_datum_per_field, *args)
+        new = per_record_us(filter_datum, *args)
+        formatted = per_record_us(formatter.format, record)
+        print(f"{len(text):>6} {old:>10.2f} {new:>12.2f} {formatted:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
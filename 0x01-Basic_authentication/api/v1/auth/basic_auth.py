@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
 """Basic auth module"""
 import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 from typing import TypeVar
 from api.v1.auth.auth import Auth
 from models.user import User
 
+CREDENTIALS_CACHE_SIZE = int(os.getenv("BASIC_AUTH_CACHE_SIZE", "1024"))
+CREDENTIALS_CACHE_TTL = float(os.getenv("BASIC_AUTH_CACHE_TTL", "60"))
+
 
 class BasicAuth(Auth):
     """Basic Authentication"""
 
+    def __init__(self):
+        """Initializes the verified-credential cache"""
+        self._credentials = OrderedDict()
+        self._credentials_lock = threading.Lock()
+        self._credentials_key = os.urandom(32)
+
     def extract_base64_authorization_header(
             self, authorization_header: str) -> str:
         """Returns Base64 part"""
@@ -54,20 +69,62 @@ class BasicAuth(Auth):
             return None
 
         try:
-            users = User.search({'email': user_email})
-            if not users or len(users) == 0:
-                return None
-            for user in users:
+            for user in User.search({'email': user_email}):
                 if user.is_valid_password(user_pwd):
                     return user
             return None
         except Exception:
             return None
 
+    def _credentials_digest(self, authorization_header: str) -> bytes:
+        """Returns keyed digest of an Authorization header"""
+        return hmac.new(self._credentials_key,
+                        authorization_header.encode('utf-8'),
+                        hashlib.sha256).digest()
+
+    def _cached_user(self, digest: bytes) -> TypeVar('User'):
+        """Returns cached user if its email and password are unchanged"""
+        with self._credentials_lock:
+            entry = self._credentials.get(digest)
+            if entry is None:
+                return None
+            user_id, email, password, expires = entry
+            if expires < time.monotonic():
+                del self._credentials[digest]
+                return None
+            self._credentials.move_to_end(digest)
+        user = User.get(user_id)
+        if user is None or user.email != email or \
+                user.password != password:
+            with self._credentials_lock:
+                self._credentials.pop(digest, None)
+            return None
+        return user
+
+    def _cache_user(self, digest: bytes, user: TypeVar('User')) -> None:
+        """Caches a verified user"""
+        with self._credentials_lock:
+            self._credentials[digest] = (
+                user.id, user.email, user.password,
+                time.monotonic() + CREDENTIALS_CACHE_TTL)
+            self._credentials.move_to_end(digest)
+            while len(self._credentials) > CREDENTIALS_CACHE_SIZE:
+                self._credentials.popitem(last=False)
+
     def current_user(self, request=None) -> TypeVar('User'):
         """Retrieves User instance for a request"""
         auth_header = self.authorization_header(request)
+        if not isinstance(auth_header, str):
+            return None
+        digest = self._credentials_digest(auth_header)
+        user = self._cached_user(digest)
+        if user is not None:
+            return user
+
         b64_header = self.extract_base64_authorization_header(auth_header)
         decoded = self.decode_base64_authorization_header(b64_header)
         email, pwd = self.extract_user_credentials(decoded)
-        return self.user_object_from_credentials(email, pwd)
+        user = self.user_object_from_credentials(email, pwd)
+        if user is not None:
+            self._cache_user(digest, user)
+        return user
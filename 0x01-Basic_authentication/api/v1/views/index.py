@@ -2,6 +2,7 @@
 """Handles API Routes"""
 from flask import jsonify, abort
 from api.v1.views import app_views
+from models.user import User
 
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
@@ -10,6 +11,12 @@ def status() -> str:
     return jsonify({"status": "OK"})
 
 
+@app_views.route('/stats', methods=['GET'], strict_slashes=False)
+def stats() -> str:
+    """Returns Object Counts"""
+    return jsonify({"users": User.count()})
+
+
 @app_views.route('/unauthorized', methods=['GET'], strict_slashes=False)
 def unauthorized() -> str:
     """Triggers Unauthorized Response"""
@@ -2,18 +2,60 @@
 """ Module of Users views
 """
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from flask import abort, jsonify, request, Response
+from models.base import dumps_json
 from models.user import User
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters:
+      - limit (optional): maximum number of users returned
+      - after (optional): return users stored after this User ID
+      - fields (optional): comma-separated attributes to return
+      - format (optional): "ndjson" for one JSON object per line
     Return:
-      - list of all User objects JSON represented
+      - list of User objects JSON represented, streamed
+      - 400 if limit is not a positive integer
+      - 400 if after is not the ID of a stored User
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            return jsonify({'error': "Wrong limit"}), 400
+    after = request.args.get('after')
+    if after is not None and User.get(after) is None:
+        return jsonify({'error': "Wrong after"}), 400
+    fields = request.args.get('fields')
+    fields = fields.split(',') if fields else None
+
+    def users_json():
+        count = 0
+        for user in User.iter_all(after):
+            if limit is not None and count >= limit:
+                break
+            user_json = user.to_json()
+            if fields is not None:
+                user_json = {k: user_json[k] for k in fields
+                             if k in user_json}
+            count += 1
+            yield dumps_json(user_json)
+
+    if request.args.get('format') == 'ndjson':
+        return Response((line + "\n" for line in users_json()),
+                        mimetype='application/x-ndjson')
+
+    def json_array():
+        yield '['
+        for i, line in enumerate(users_json()):
+            yield line if i == 0 else ',' + line
+        yield ']'
+    return Response(json_array(), mimetype='application/json')
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+""" SQLite storage engine module
+"""
+from os import getenv
+from typing import Iterator, List, TypeVar
+import sqlite3
+import threading
+from models.base import dumps_json, loads_json
+
+
+class SQLiteEngine():
+    """ Storage engine keeping objects in a SQLite database
+    """
+
+    def __init__(self, db_path: str = None):
+        """ Initialize the engine
+        """
+        self.db_path = db_path or getenv("STORE_SQLITE_PATH",
+                                         ".db_store.sqlite3")
+        self._local = threading.local()
+        self._tables = set()
+        self._tables_lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """ Return the connection of the current thread
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _table(self, cls) -> str:
+        """ Return the table of a class, creating it on first use along
+        with the triggers keeping its row count in the _row_counts table
+        """
+        table = cls.__name__
+        if table in self._tables:
+            return table
+        with self._tables_lock:
+            if table in self._tables:
+                return table
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                columns = "".join(', "{}"'.format(name)
+                                  for name in cls.indexed_attributes)
+                conn.execute('CREATE TABLE IF NOT EXISTS "{}" '
+                             '(id TEXT PRIMARY KEY, data TEXT NOT NULL{})'
+                             .format(table, columns))
+                for name in cls.indexed_attributes:
+                    conn.execute('CREATE INDEX IF NOT EXISTS "ix_{0}_{1}" '
+                                 'ON "{0}" ("{1}")'.format(table, name))
+                conn.execute('CREATE TABLE IF NOT EXISTS _row_counts '
+                             '(name TEXT PRIMARY KEY, n INTEGER NOT NULL)')
+                for event, sign in (("INSERT", "+"), ("DELETE", "-")):
+                    conn.execute(
+                        'CREATE TRIGGER IF NOT EXISTS "{0}_count_{1}" '
+                        'AFTER {1} ON "{0}" BEGIN UPDATE _row_counts '
+                        'SET n = n {2} 1 WHERE name = \'{0}\'; END'
+                        .format(table, event, sign))
+                conn.execute('INSERT OR IGNORE INTO _row_counts (name, n) '
+                             'SELECT ?, COUNT(*) FROM "{}"'.format(table),
+                             (table,))
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._tables.add(table)
+        return table
+
+    def save(self, obj: TypeVar('Base')):
+        """ Update an object in place, keeping its rowid so the storage
+        order stays stable, or insert it
+        """
+        cls = obj.__class__
+        table = self._table(cls)
+        names = ("id", "data") + tuple(cls.indexed_attributes)
+        values = [obj.id, dumps_json(obj.to_json(True))]
+        values.extend(getattr(obj, name, None)
+                      for name in cls.indexed_attributes)
+        with self._connection() as conn:
+            updated = conn.execute(
+                'UPDATE "{}" SET {} WHERE id = ?'.format(
+                    table, ", ".join('"{}" = ?'.format(name)
+                                     for name in names[1:])),
+                values[1:] + [obj.id]).rowcount
+            if not updated:
+                conn.execute('INSERT INTO "{}" ({}) VALUES ({})'.format(
+                    table, ", ".join('"{}"'.format(name) for name in names),
+                    ", ".join("?" * len(names))), values)
+
+    def remove(self, obj: TypeVar('Base')):
+        """ Delete an object
+        """
+        table = self._table(obj.__class__)
+        with self._connection() as conn:
+            conn.execute('DELETE FROM "{}" WHERE id = ?'.format(table),
+                         (obj.id,))
+
+    def remove_all(self, cls, objs: List[TypeVar('Base')]) -> int:
+        """ Delete several objects in one transaction
+        """
+        table = self._table(cls)
+        with self._connection() as conn:
+            return conn.executemany(
+                'DELETE FROM "{}" WHERE id = ?'.format(table),
+                [(obj.id,) for obj in objs]).rowcount
+
+    def count(self, cls) -> int:
+        """ Count the objects of a class from the row count the table
+        triggers maintain, shared by every process using the database
+        """
+        table = self._table(cls)
+        return self._connection().execute(
+            "SELECT n FROM _row_counts WHERE name = ?",
+            (table,)).fetchone()[0]
+
+    def get(self, cls, obj_id: str) -> TypeVar('Base'):
+        """ Return one object by ID
+        """
+        table = self._table(cls)
+        row = self._connection().execute(
+            'SELECT data FROM "{}" WHERE id = ?'.format(table),
+            (obj_id,)).fetchone()
+        return cls(**loads_json(row[0])) if row else None
+
+    def search(self, cls, attributes: dict) -> List[TypeVar('Base')]:
+        """ Return objects matching attributes
+        """
+        return list(self.iter_search(cls, attributes))
+
+    def iter_after(self, cls, obj_id: str) -> Iterator[TypeVar('Base')]:
+        """ Yield objects stored after an ID, seeking on the rowid
+        """
+        table = self._table(cls)
+        query = ('SELECT data FROM "{0}" WHERE rowid > '
+                 '(SELECT rowid FROM "{0}" WHERE id = ?) ORDER BY rowid'
+                 .format(table))
+        for row in self._connection().execute(query, (obj_id,)):
+            yield cls(**loads_json(row[0]))
+
+    def iter_search(self, cls,
+                    attributes: dict) -> Iterator[TypeVar('Base')]:
+        """ Yield objects matching attributes, filtering indexed
+        attributes in SQL and the others in Python
+        """
+        table = self._table(cls)
+        where = []
+        params = []
+        for name in cls.indexed_attributes:
+            if name in attributes:
+                where.append('"{}" IS ?'.format(name))
+                params.append(attributes[name])
+        query = 'SELECT data FROM "{}"'.format(table)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        rest = {k: v for k, v in attributes.items()
+                if k not in cls.indexed_attributes}
+        for row in self._connection().execute(query, params):
+            obj = cls(**loads_json(row[0]))
+            if all(getattr(obj, k) == v for k, v in rest.items()):
+                yield obj
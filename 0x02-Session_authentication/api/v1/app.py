@@ -4,12 +4,31 @@ from os import getenv
 from api.v1.views import app_views
 from flask import Flask, jsonify, abort, request
 from flask_cors import (CORS, cross_origin)
+from api.v1.auth.auth import ExcludedPaths
+from models.base import dumps_json, loads_json, orjson
 import os
 
 
 app = Flask(__name__)
 app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
+
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """JSON provider backed by orjson"""
+
+        def dumps(self, obj, **kwargs) -> str:
+            """Serializes JSON responses"""
+            return dumps_json(obj)
+
+        def loads(self, s, **kwargs):
+            """Parses JSON request bodies"""
+            return loads_json(s)
+
+    app.json = ORJSONProvider(app)
+
 auth = None
 auth_type = getenv('AUTH_TYPE')
 
@@ -19,10 +38,18 @@ if auth_type == 'basic_auth':
 elif auth_type == 'session_auth':
     from api.v1.auth.session_auth import SessionAuth
     auth = SessionAuth()
+elif auth_type == 'session_db_auth':
+    from api.v1.auth.session_db_auth import SessionDBAuth
+    auth = SessionDBAuth()
 elif auth_type == 'auth':
     from api.v1.auth.auth import Auth
     auth = Auth()
 
+EXCLUDED_PATHS = ExcludedPaths(['/api/v1/status/',
+                                '/api/v1/unauthorized/',
+                                '/api/v1/forbidden/',
+                                '/api/v1/auth_session/login/'])
+
 
 @app.before_request
 def before_request():
@@ -30,21 +57,17 @@ def before_request():
     if auth is None:
         return
 
-    excluded_paths = ['/api/v1/status/',
-                     '/api/v1/unauthorized/',
-                     '/api/v1/forbidden/',
-                     '/api/v1/auth_session/login/']
-
-    if not auth.require_auth(request.path, excluded_paths):
+    if not auth.require_auth(request.path, EXCLUDED_PATHS):
         return
 
     if auth.authorization_header(request) is None and auth.session_cookie(request) is None:
         abort(401)
 
-    if auth.current_user(request) is None:
+    current_user = auth.current_user(request)
+    if current_user is None:
         abort(403)
 
-    request.current_user = auth.current_user(request)
+    request.current_user = current_user
 
 
 @app.errorhandler(404)
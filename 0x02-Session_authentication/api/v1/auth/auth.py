@@ -1,28 +1,55 @@
 #!/usr/bin/env python3
 """Handles Basic Authentication"""
+import re
 from flask import request
-from typing import List, TypeVar
+from functools import lru_cache
+from typing import Iterable, List, TypeVar, Union
 from os import getenv
 
 
+class ExcludedPaths:
+    """Compiled matcher for excluded paths"""
+
+    def __init__(self, excluded_paths: Iterable[str]):
+        """Splits paths into an exact set and one prefix pattern"""
+        self.paths = tuple(excluded_paths)
+        self.exact = frozenset(p for p in self.paths if not p.endswith('*'))
+        prefixes = [p[:-1] for p in self.paths if p.endswith('*')]
+        self.prefix = None
+        if prefixes:
+            self.prefix = re.compile('|'.join(map(re.escape, prefixes)))
+
+    def __len__(self) -> int:
+        """Number of excluded paths"""
+        return len(self.paths)
+
+    def match(self, path: str) -> bool:
+        """Checks if a normalized path is excluded"""
+        if path in self.exact:
+            return True
+        return self.prefix is not None and self.prefix.match(path) is not None
+
+
+@lru_cache(maxsize=32)
+def _compile_excluded_paths(excluded_paths: tuple) -> ExcludedPaths:
+    """Returns cached matcher for a list of excluded paths"""
+    return ExcludedPaths(excluded_paths)
+
+
 class Auth:
     """Manages Authentication System"""
 
-    def require_auth(self, path: str, excluded_paths: List[str]) -> bool:
+    def require_auth(self, path: str,
+                     excluded_paths: Union[List[str], ExcludedPaths]) -> bool:
         """Validates Authentication Path"""
         if path is None or excluded_paths is None or not excluded_paths:
             return True
 
         path = path if path.endswith('/') else path + '/'
 
-        for excluded_path in excluded_paths:
-            if excluded_path.endswith('*'):
-                if path.startswith(excluded_path[:-1]):
-                    return False
-            elif path == excluded_path:
-                return False
-
-        return True
+        if not isinstance(excluded_paths, ExcludedPaths):
+            excluded_paths = _compile_excluded_paths(tuple(excluded_paths))
+        return not excluded_paths.match(path)
 
     def authorization_header(self, request=None) -> str:
         """Gets Authorization Header"""
@@ -1,26 +1,47 @@
-#!/usr/bin/env python3
-"""Session authentication module"""
-from api.v1.auth.auth import Auth
-from models.user import User
-import uuid
-
-
-class SessionAuth(Auth):
-    """Session Authentication"""
-    user_id_by_session_id = {}
-
-    def create_session(self, user_id: str = None) -> str:
-        """Creates a Session ID for a user_id"""
-        if user_id is None or not isinstance(user_id, str):
-            return None
-        
-        session_id = str(uuid.uuid4())
-        self.user_id_by_session_id[session_id] = user_id
-        return session_id
-
-    def user_id_for_session_id(self, session_id: str = None) -> str:
-        """Returns a User ID based on a Session ID"""
-        if session_id is None or not isinstance(session_id, str):
-            return None
-        
-        return self.user_id_by_session_id.get(session_id)
+#!/usr/bin/env python3
+"""Session authentication module"""
+from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import get_session_store
+from models.user import User
+from os import getenv
+from typing import TypeVar
+import time
+import uuid
+
+
+class SessionAuth(Auth):
+    """Session Authentication"""
+    session_duration = int(getenv('SESSION_DURATION', '0'))
+
+    def __init__(self):
+        """Initializes the session store"""
+        self.store = get_session_store()
+
+    def create_session(self, user_id: str = None) -> str:
+        """Creates a Session ID for a user_id"""
+        if user_id is None or not isinstance(user_id, str):
+            return None
+
+        session_id = str(uuid.uuid4())
+        self.store.set(session_id, user_id, self.session_expires_at())
+        return session_id
+
+    def session_expires_at(self, now: float = None) -> float:
+        """Returns the expiry time of a session created now"""
+        if self.session_duration <= 0:
+            return None
+        return (time.time() if now is None else now) + self.session_duration
+
+    def user_id_for_session_id(self, session_id: str = None) -> str:
+        """Returns a User ID based on a Session ID"""
+        if session_id is None or not isinstance(session_id, str):
+            return None
+
+        return self.store.get(session_id)
+
+    def current_user(self, request=None) -> TypeVar('User'):
+        """Returns a User instance based on the session cookie"""
+        user_id = self.user_id_for_session_id(self.session_cookie(request))
+        if user_id is None:
+            return None
+        return User.get(user_id)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Session database authentication module"""
+from api.v1.auth.session_auth import SessionAuth
+from models.user_session import UserSession
+import time
+
+
+class SessionDBAuth(SessionAuth):
+    """Session Authentication persisted through UserSession"""
+
+    def __init__(self):
+        """Loads persisted sessions and warms the session store"""
+        super().__init__()
+        UserSession.load_from_file()
+        self.purge_expired()
+        for user_session in UserSession.all():
+            self.store.set(user_session.session_id, user_session.user_id,
+                           user_session.expires_at)
+
+    def create_session(self, user_id: str = None) -> str:
+        """Creates and persists a Session ID for a user_id"""
+        now = time.time()
+        if now - self._last_purge >= self.store.sweep_interval:
+            self.purge_expired(now)
+        session_id = super().create_session(user_id)
+        if session_id is None:
+            return None
+
+        UserSession(user_id=user_id, session_id=session_id,
+                    expires_at=self.session_expires_at(now)).save()
+        return session_id
+
+    def user_id_for_session_id(self, session_id: str = None) -> str:
+        """Returns a User ID from the store or the persisted sessions"""
+        user_id = super().user_id_for_session_id(session_id)
+        if user_id is not None or session_id is None:
+            return user_id
+
+        user_session = UserSession.find_one({'session_id': session_id})
+        if user_session is None:
+            return None
+        expires_at = user_session.expires_at
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        self.store.set(session_id, user_session.user_id, expires_at)
+        return user_session.user_id
+
+    def purge_expired(self, now: float = None) -> int:
+        """Removes every expired persisted session"""
+        now = time.time() if now is None else now
+        self._last_purge = now
+        removed = UserSession.remove_all(
+            user_session for user_session in UserSession.iter_all()
+            if user_session.expires_at is not None
+            and user_session.expires_at <= now)
+        self.store.purge_expired(now)
+        return removed
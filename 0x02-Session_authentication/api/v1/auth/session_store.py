@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Session storage backends module"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from os import getenv
+import json
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+
+
+class SessionStore(ABC):
+    """Session storage interface"""
+    sweep_interval = int(getenv('SESSION_SWEEP_INTERVAL', '60'))
+
+    @abstractmethod
+    def set(self, session_id: str, user_id: str,
+            expires_at: float = None) -> None:
+        """Stores a session"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Removes a session"""
+
+    @abstractmethod
+    def purge_expired(self, now: float = None) -> int:
+        """Removes every expired session in one batch"""
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU session store"""
+
+    def __init__(self, max_size: int = None):
+        """Initializes the store"""
+        if max_size is None:
+            max_size = int(getenv('SESSION_MAX_SIZE', '100000'))
+        self.max_size = max_size
+        self.user_id_by_session_id = OrderedDict()
+        self.session_expires_at = {}
+        self._last_sweep = time.time()
+        self._lock = threading.Lock()
+
+    def set(self, session_id: str, user_id: str,
+            expires_at: float = None) -> None:
+        """Stores a session"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._purge(now)
+            self.user_id_by_session_id[session_id] = user_id
+            self.user_id_by_session_id.move_to_end(session_id)
+            if expires_at is not None:
+                self.session_expires_at[session_id] = expires_at
+            while len(self.user_id_by_session_id) > self.max_size:
+                oldest, _ = self.user_id_by_session_id.popitem(last=False)
+                self.session_expires_at.pop(oldest, None)
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session"""
+        with self._lock:
+            user_id = self.user_id_by_session_id.get(session_id)
+            if user_id is None:
+                return None
+            expires_at = self.session_expires_at.get(session_id)
+            if expires_at is not None and expires_at <= time.time():
+                self._drop(session_id)
+                return None
+            self.user_id_by_session_id.move_to_end(session_id)
+            return user_id
+
+    def delete(self, session_id: str) -> None:
+        """Removes a session"""
+        with self._lock:
+            self._drop(session_id)
+
+    def purge_expired(self, now: float = None) -> int:
+        """Removes every expired session in one batch"""
+        with self._lock:
+            return self._purge(time.time() if now is None else now)
+
+    def _drop(self, session_id: str) -> None:
+        """Removes a session, lock must be held"""
+        self.user_id_by_session_id.pop(session_id, None)
+        self.session_expires_at.pop(session_id, None)
+
+    def _purge(self, now: float) -> int:
+        """Removes expired sessions, lock must be held"""
+        expired = [session_id for session_id, expires_at
+                   in self.session_expires_at.items() if expires_at <= now]
+        for session_id in expired:
+            self._drop(session_id)
+        self._last_sweep = now
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store shared through a SQLite file"""
+
+    def __init__(self, db_path: str = None):
+        """Initializes the store and its table"""
+        self.db_path = db_path or getenv('SESSION_DB_PATH', '.db_sessions.db')
+        self._local = threading.local()
+        self._last_sweep = time.time()
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                         "session_id TEXT PRIMARY KEY, "
+                         "user_id TEXT NOT NULL, expires_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_expires_at "
+                         "ON sessions (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def set(self, session_id: str, user_id: str,
+            expires_at: float = None) -> None:
+        """Stores a session"""
+        now = time.time()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.purge_expired(now)
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO sessions "
+                         "(session_id, user_id, expires_at) VALUES (?, ?, ?)",
+                         (session_id, user_id, expires_at))
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session"""
+        row = self._connection().execute(
+            "SELECT user_id FROM sessions WHERE session_id = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (session_id, time.time())).fetchone()
+        return row[0] if row else None
+
+    def delete(self, session_id: str) -> None:
+        """Removes a session"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?",
+                         (session_id,))
+
+    def purge_expired(self, now: float = None) -> int:
+        """Removes every expired session in one batch"""
+        now = time.time() if now is None else now
+        self._last_sweep = now
+        with self._connection() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?",
+                                (now,)).rowcount
+
+
+class SocketSessionStore(SessionStore):
+    """Client of a session server shared by several processes"""
+
+    def __init__(self, host: str = None, port: int = None):
+        """Initializes the client"""
+        self.address = (host or getenv('SESSION_SERVER_HOST', '127.0.0.1'),
+                        int(port or getenv('SESSION_SERVER_PORT', '5050')))
+        self._local = threading.local()
+
+    def _connect(self):
+        """Opens the connection of the current thread"""
+        sock = socket.create_connection(self.address)
+        self._local.sock = sock
+        self._local.stream = sock.makefile('rw')
+        return self._local.stream
+
+    def _close(self) -> None:
+        """Closes the connection of the current thread"""
+        stream = getattr(self._local, 'stream', None)
+        sock = getattr(self._local, 'sock', None)
+        self._local.stream = self._local.sock = None
+        for closable in (stream, sock):
+            if closable is None:
+                continue
+            try:
+                closable.close()
+            except OSError:
+                pass
+
+    def _call(self, op: str, **kwargs):
+        """Sends one request and returns the server result, retrying
+        once on a fresh connection if the current one is broken"""
+        request = json.dumps(dict(kwargs, op=op)) + "\n"
+        for attempt in range(2):
+            try:
+                stream = getattr(self._local, 'stream', None)
+                if stream is None:
+                    stream = self._connect()
+                stream.write(request)
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError(
+                        "Session server closed the connection")
+                break
+            except OSError:
+                self._close()
+                if attempt:
+                    raise
+        response = json.loads(line)
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response.get('result')
+
+    def set(self, session_id: str, user_id: str,
+            expires_at: float = None) -> None:
+        """Stores a session"""
+        self._call('set', session_id=session_id, user_id=user_id,
+                   expires_at=expires_at)
+
+    def get(self, session_id: str) -> str:
+        """Returns the user ID of a live session"""
+        return self._call('get', session_id=session_id)
+
+    def delete(self, session_id: str) -> None:
+        """Removes a session"""
+        self._call('delete', session_id=session_id)
+
+    def purge_expired(self, now: float = None) -> int:
+        """Removes every expired session in one batch"""
+        return self._call('purge_expired', now=now)
+
+
+class SessionRequestHandler(socketserver.StreamRequestHandler):
+    """Serves line-delimited JSON session requests"""
+    operations = ('set', 'get', 'delete', 'purge_expired')
+
+    def handle(self):
+        """Answers requests until the client disconnects"""
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be an object")
+                op = request.pop('op', None)
+                if op not in self.operations:
+                    raise ValueError("Unknown operation: {}".format(op))
+                response = {'result': getattr(self.server.store, op)(
+                    **request)}
+            except (ValueError, TypeError) as err:
+                response = {'error': str(err)}
+            self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+
+
+class SessionServer(socketserver.ThreadingTCPServer):
+    """Local session server backed by a MemorySessionStore"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple, store: SessionStore = None):
+        """Initializes the server"""
+        super().__init__(address, SessionRequestHandler)
+        self.store = store or MemorySessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """Returns the store selected by SESSION_BACKEND"""
+    backend = getenv('SESSION_BACKEND', 'memory')
+    if backend == 'sqlite':
+        return SQLiteSessionStore()
+    if backend == 'socket':
+        return SocketSessionStore()
+    return MemorySessionStore()
+
+
+if __name__ == "__main__":
+    host = getenv('SESSION_SERVER_HOST', '127.0.0.1')
+    port = int(getenv('SESSION_SERVER_PORT', '5050'))
+    with SessionServer((host, port)) as server:
+        server.serve_forever()
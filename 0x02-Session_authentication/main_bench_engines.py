@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" Benchmark of the JSON file storage against the SQLite engine at
+growing user counts. Run it from this directory, it works inside a
+temporary directory.
+"""
+import os
+import random
+import tempfile
+import time
+import models.base as base
+from models.sqlite_engine import SQLiteEngine
+from models.user import User
+
+SIZES = [int(size) for size in
+         os.getenv("BENCH_SIZES", "10000,100000,1000000").split(",")]
+LOOKUPS = int(os.getenv("BENCH_LOOKUPS", "2000"))
+
+
+def timed(func) -> float:
+    """ Return the seconds a call takes """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def fill(size: int) -> float:
+    """ Save size new users, returning microseconds per save """
+    def save_all():
+        for i in range(size):
+            User(email="user{}@bench".format(i)).save()
+        base.flush_all()
+    return timed(save_all) / size * 1e6
+
+
+def lookups(size: int) -> tuple:
+    """ Return microseconds per get and per indexed search """
+    ids = [user.id for user in User.search(limit=LOOKUPS)]
+    emails = ["user{}@bench".format(random.randrange(size))
+              for _ in range(LOOKUPS)]
+    get = timed(lambda: [User.get(obj_id) for obj_id in ids])
+    search = timed(lambda: [User.find_one({'email': email})
+                            for email in emails])
+    return get / len(ids) * 1e6, search / len(emails) * 1e6
+
+
+def run(engine: str, size: int) -> tuple:
+    """ Fill a fresh store, then time reads, a full scan and a reload """
+    os.chdir(tempfile.mkdtemp(prefix="bench_engines_"))
+    base.DATA.clear()
+    base.INDEXES.clear()
+    base.ENGINE = SQLiteEngine("bench.sqlite3") if engine == "sqlite" \
+        else None
+    User.load_from_file()
+    save = fill(size)
+    get, search = lookups(size)
+    count = timed(User.count) * 1e6
+    scan = timed(lambda: sum(1 for _ in User.iter_all()))
+    if engine == "json":
+        User.save_to_file()
+        base.DATA.clear()
+        base.INDEXES.clear()
+    load = timed(User.load_from_file)
+    return save, get, search, count, scan, load
+
+
+if __name__ == "__main__":
+    print("{:>8} {:>6} {:>8} {:>8} {:>9} {:>8} {:>7} {:>7}".format(
+        "users", "engine", "save us", "get us", "search us", "count us",
+        "scan s", "load s"))
+    for size in SIZES:
+        for engine in ("json", "sqlite"):
+            print("{:>8} {:>6} {:>8.1f} {:>8.1f} {:>9.1f} {:>8.1f} "
+                  "{:>7.2f} {:>7.2f}".format(size, engine,
+                                             *run(engine, size)))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+""" Benchmark of Auth.require_auth with long excluded path lists: the
+compiled matcher against the previous linear scan
+"""
+import os
+import timeit
+from typing import List
+from api.v1.auth.auth import Auth, ExcludedPaths
+
+RULES = [int(count) for count in
+         os.getenv("BENCH_RULES", "10,100,300,1000").split(",")]
+CHECKS = int(os.getenv("BENCH_CHECKS", "20000"))
+
+
+def require_auth_linear(path: str, excluded_paths: List[str]) -> bool:
+    """ Previous implementation: scan every rule for each request """
+    if path is None or excluded_paths is None or not excluded_paths:
+        return True
+    path = path if path.endswith('/') else path + '/'
+    for excluded_path in excluded_paths:
+        if excluded_path.endswith('*'):
+            if path.startswith(excluded_path[:-1]):
+                return False
+        elif path == excluded_path:
+            return False
+    return True
+
+
+def rules(count: int) -> List[str]:
+    """ Return tenant rules, one in four a wildcard """
+    return ["/api/v1/tenants/t{}/{}".format(
+        i, "public*" if i % 4 == 0 else "status/") for i in range(count)]
+
+
+def per_check_us(func, *args) -> float:
+    """ Return the mean cost of one check in microseconds """
+    return timeit.timeit(lambda: func(*args), number=CHECKS) / CHECKS * 1e6
+
+
+if __name__ == "__main__":
+    auth = Auth()
+    print("{:>6} {:>12} {:>12} {:>12} {:>12}  (us per request)".format(
+        "rules", "miss linear", "miss comp.", "hit linear", "hit comp."))
+    for count in RULES:
+        paths = rules(count)
+        matcher = ExcludedPaths(paths)
+        miss = "/api/v1/users/me"
+        hit = "/api/v1/tenants/t{}/public/page".format(count // 4 * 4 - 4)
+        for path in (miss, hit):
+            assert require_auth_linear(path, paths) == \
+                auth.require_auth(path, matcher)
+        print("{:>6} {:>12.2f} {:>12.2f} {:>12.2f} {:>12.2f}".format(
+            count, per_check_us(require_auth_linear, miss, paths),
+            per_check_us(auth.require_auth, miss, matcher),
+            per_check_us(require_auth_linear, hit, paths),
+            per_check_us(auth.require_auth, hit, matcher)))
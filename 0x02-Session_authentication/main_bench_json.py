@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+""" Benchmark of serializing users: to_json with cached field lists and
+timestamp strings through dumps_json, against the previous per-call
+strftime and stdlib json
+"""
+import json
+import os
+import time
+from datetime import datetime
+import models.base as base
+from models.base import TIMESTAMP_FORMAT, dumps_json
+from models.user import User
+
+USERS = int(os.getenv("BENCH_USERS", "100000"))
+
+
+def to_json_previous(obj, for_serialization: bool = False) -> dict:
+    """ Previous to_json: walk every field, formatting datetimes """
+    result = {}
+    for key in ('id', 'created_at', 'updated_at', 'email', '_password',
+                'first_name', 'last_name'):
+        if not for_serialization and key[0] == '_':
+            continue
+        value = getattr(obj, key)
+        if type(value) is datetime:
+            result[key] = value.strftime(TIMESTAMP_FORMAT)
+        else:
+            result[key] = value
+    return result
+
+
+def timed(label: str, func, users: list):
+    """ Print the time to serialize every user into one JSON document """
+    start = time.perf_counter()
+    func(users)
+    elapsed = time.perf_counter() - start
+    print("{:<37} {:>7.3f}s {:>7.2f} us/user".format(
+        label, elapsed, elapsed / len(users) * 1e6))
+
+
+if __name__ == "__main__":
+    users = [User(email="user{}@bench".format(i), first_name="Ada",
+                  last_name="Lovelace", _password="x" * 64)
+             for i in range(USERS)]
+    print("{} users, encoder backend: {}".format(
+        USERS, "orjson" if base.orjson is not None else "json"))
+    timed("previous to_json + json.dumps",
+          lambda objs: json.dumps([to_json_previous(u) for u in objs]),
+          users)
+    timed("to_json + json.dumps",
+          lambda objs: json.dumps([u.to_json() for u in objs]), users)
+    timed("to_json + dumps_json",
+          lambda objs: dumps_json([u.to_json() for u in objs]), users)
+    timed("snapshot: previous + json.dumps",
+          lambda objs: json.dumps({u.id: to_json_previous(u, True)
+                                   for u in objs}), users)
+    timed("snapshot: to_json(True) + dumps_json",
+          lambda objs: dumps_json({u.id: u.to_json(True) for u in objs}),
+          users)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+""" Benchmark of memory per user: the slotted User with interned names
+and cached timestamps against the previous __dict__ based records
+"""
+import hashlib
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from models.base import TIMESTAMP_CACHES, TIMESTAMP_FORMAT
+from models.user import User
+
+USERS = int(os.getenv("BENCH_USERS", "20000"))
+FIRST_NAMES = ("Ada", "Bob", "Chloe", "Dan", "Eve", "Farid", "Gus", "Hana")
+LAST_NAMES = ("Lovelace", "Smith", "Martin", "Nguyen", "Okafor", "Diaz")
+
+
+class DictUser():
+    """ Previous layout: a __dict__ with two datetime instances """
+
+    def __init__(self, **kwargs):
+        """ Initialize like the previous Base and User constructors """
+        self.id = kwargs['id']
+        self.created_at = datetime.strptime(kwargs['created_at'],
+                                            TIMESTAMP_FORMAT)
+        self.updated_at = datetime.strptime(kwargs['updated_at'],
+                                            TIMESTAMP_FORMAT)
+        self.email = kwargs['email']
+        self._password = kwargs['_password']
+        self.first_name = kwargs['first_name']
+        self.last_name = kwargs['last_name']
+
+
+def records():
+    """ Yield serialized users as they are read back from the store """
+    now = datetime.utcnow().strftime(TIMESTAMP_FORMAT)
+    for i in range(USERS):
+        yield {'id': str(uuid.uuid4()), 'created_at': now,
+               'updated_at': now, 'email': "user{}@bench".format(i),
+               '_password': hashlib.sha256(str(i).encode()).hexdigest(),
+               # Decoded JSON gives each record its own string objects
+               'first_name': "".join(FIRST_NAMES[i % len(FIRST_NAMES)]),
+               'last_name': "".join(LAST_NAMES[i % len(LAST_NAMES)])}
+
+
+def bytes_per_user(cls) -> float:
+    """ Return the traced bytes held per user in an id keyed store """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store = {}
+    for record in records():
+        store[record['id']] = cls(**record)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(store)
+
+
+def cached_timestamp_bytes() -> int:
+    """ Return the bytes of the timestamp strings a User caches """
+    user = User(**next(records()))
+    return sum(sys.getsizeof(getattr(user, name))
+               for name in TIMESTAMP_CACHES.values())
+
+
+if __name__ == "__main__":
+    before = bytes_per_user(DictUser)
+    after = bytes_per_user(User)
+    print("{} users".format(USERS))
+    print("{:>10} {:>14}".format("layout", "bytes/user"))
+    print("{:>10} {:>14.0f}".format("__dict__", before))
+    print("{:>10} {:>14.0f}".format("slotted", after))
+    print("saved {:.0%}; the slotted figure includes {} bytes/user of "
+          "cached timestamp strings".format(1 - after / before,
+                                            cached_timestamp_bytes()))
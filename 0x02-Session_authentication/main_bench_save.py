@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+""" Benchmark of User.save() on the journaled file storage: the time of
+each chunk of saves stays flat as the store grows when writes are linear.
+Run it from this directory, it works inside a temporary directory.
+"""
+import os
+import tempfile
+import time
+import models.base as base
+from models.user import User
+
+SAVES = int(os.getenv("BENCH_SAVES", "100000"))
+CHUNK = int(os.getenv("BENCH_CHUNK", "10000"))
+
+
+def reset():
+    """ Start from an empty User store """
+    base.flush_all()
+    base.DATA.clear()
+    base.INDEXES.clear()
+    for name in os.listdir("."):
+        if name.startswith(".db_User"):
+            os.remove(name)
+    User.load_from_file()
+
+
+def run(durability: str):
+    """ Save SAVES new users, reporting the cost of each chunk """
+    base.set_durability(durability)
+    reset()
+    print("durability={}".format(durability))
+    print("{:>8} {:>9} {:>10}".format("users", "chunk s", "us/save"))
+    total = time.perf_counter()
+    for first in range(0, SAVES, CHUNK):
+        start = time.perf_counter()
+        for i in range(first, min(first + CHUNK, SAVES)):
+            User(email="user{}@bench".format(i)).save()
+        elapsed = time.perf_counter() - start
+        done = min(first + CHUNK, SAVES)
+        print("{:>8} {:>9.2f} {:>10.1f}".format(
+            done, elapsed, elapsed / (done - first) * 1e6))
+    base.flush_all()
+    print("total {:.2f}s for {} saves\n".format(
+        time.perf_counter() - total, SAVES))
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp(prefix="bench_save_"))
+    for durability in ("sync", "batch"):
+        run(durability)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+""" Stress script for the file storage: many threads read while others
+save and remove, with the journal compacted and reloaded meanwhile.
+Run it from this directory, it works inside a temporary directory.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import models.base as base
+from models.user import User
+
+SEED_USERS = int(os.getenv("STRESS_SEED_USERS", "500"))
+READERS = int(os.getenv("STRESS_READERS", "6"))
+WRITERS = int(os.getenv("STRESS_WRITERS", "6"))
+DURATION = float(os.getenv("STRESS_SECONDS", "3"))
+
+
+def reset(mode: str) -> set:
+    """ Start an empty store in the given load mode with seed users,
+    reloaded from a snapshot so the lazy mode maps it
+    """
+    base.LOAD_MODE = mode
+    base.DATA.clear()
+    base.INDEXES.clear()
+    for name in os.listdir("."):
+        if name.startswith(".db_User"):
+            os.remove(name)
+    User.load_from_file()
+    seeds = set()
+    for i in range(SEED_USERS):
+        user = User(email="seed{}@stress".format(i))
+        user.save()
+        seeds.add(user.id)
+    User.save_to_file()
+    User.load_from_file()
+    return seeds
+
+
+def writer(stop: threading.Event, number: int, live: set):
+    """ Save, update and remove users owned by this thread """
+    i = 0
+    while not stop.is_set():
+        user = User(email="w{}-{}@stress".format(number, i))
+        user.save()
+        live.add(user.id)
+        if i % 3 == 1:
+            user.first_name = "updated"
+            user.save()
+        if i % 3 == 2:
+            user.remove()
+            live.discard(user.id)
+        i += 1
+
+
+def reader(stop: threading.Event, number: int, seeds: list):
+    """ Read through every lock-free path and check what comes back """
+    i = 0
+    while not stop.is_set():
+        seed_id = seeds[(number + i) % len(seeds)]
+        user = User.get(seed_id)
+        assert user is not None and user.id == seed_id, seed_id
+        email = user.email
+        found = User.search({'email': email})
+        assert [u.id for u in found] == [seed_id], (email, found)
+        assert User.find_one({'email': email}).id == seed_id
+        assert User.count() >= len(seeds)
+        for user in User.search({'first_name': 'updated'}, limit=20):
+            assert user.first_name == 'updated'
+        if i % 50 == 0:
+            assert len(User.all()) >= len(seeds)
+            assert sum(1 for _ in User.iter_all(seed_id)) >= 0
+        i += 1
+
+
+def maintainer(stop: threading.Event):
+    """ Compact the journal and reload the store while others run """
+    while not stop.is_set():
+        User.save_to_file()
+        time.sleep(0.05)
+        User.load_from_file()
+        time.sleep(0.05)
+
+
+def run(target, errors: list, stop: threading.Event, *args):
+    """ Run a thread body, keeping its failure and stopping the others """
+    try:
+        target(stop, *args)
+    except BaseException as err:
+        errors.append("{}: {!r}".format(target.__name__, err))
+        stop.set()
+
+
+def check(expected: set) -> list:
+    """ Compare DATA, INDEXES and a fresh reload with the expected ids """
+    problems = []
+    User.flush()
+    ids = {user.id for user in User.all()}
+    if ids != expected or User.count() != len(expected):
+        problems.append("stored {} users, expected {}".format(
+            User.count(), len(expected)))
+    by_email = base.INDEXES.get('User', {}).get('email', {})
+    indexed = set()
+    for email, email_ids in by_email.items():
+        indexed.update(email_ids)
+        for obj_id in email_ids:
+            user = User.get(obj_id)
+            if user is None or user.email != email:
+                problems.append("stale index entry {}".format(email))
+    if indexed != ids:
+        problems.append("index holds {} ids for {} users".format(
+            len(indexed), len(ids)))
+    base.DATA.clear()
+    base.INDEXES.clear()
+    User.load_from_file()
+    if {user.id for user in User.all()} != expected:
+        problems.append("reload lost or resurrected users")
+    return problems
+
+
+def stress(mode: str) -> bool:
+    """ Run readers, writers and a maintainer in one load mode """
+    seeds = reset(mode)
+    seed_list = sorted(seeds)
+    stop = threading.Event()
+    errors = []
+    lives = [set() for _ in range(WRITERS)]
+    threads = [threading.Thread(target=run,
+                                args=(writer, errors, stop, i, lives[i]))
+               for i in range(WRITERS)]
+    threads += [threading.Thread(target=run,
+                                 args=(reader, errors, stop, i, seed_list))
+                for i in range(READERS)]
+    threads.append(threading.Thread(target=run,
+                                    args=(maintainer, errors, stop)))
+    for thread in threads:
+        thread.start()
+    stop.wait(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    expected = set(seeds).union(*lives)
+    problems = errors + check(expected)
+    print("{}: {} users, {}".format(mode, len(expected),
+                                    "; ".join(problems) or "OK"))
+    return not problems
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp(prefix="stress_store_"))
+    results = [stress(mode) for mode in ("eager", "lazy")]
+    sys.exit(0 if all(results) else 1)
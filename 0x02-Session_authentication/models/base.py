@@ -1,20 +1,329 @@
 #!/usr/bin/env python3
 """ Base module
 """
+from collections.abc import MutableMapping
 from datetime import datetime
-from typing import TypeVar, List, Iterable
-from os import path
+from itertools import islice
+from typing import TypeVar, List, Iterable, Iterator
+from os import getenv, path
+import atexit
 import json
+import mmap
+import os
+import sys
+import threading
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+JOURNAL_COMPACT_MIN = int(getenv("JOURNAL_COMPACT_MIN", "1000"))
+LOAD_MODE = getenv("STORE_LOAD_MODE", "eager")
+STORE_ENGINE = getenv("STORE_ENGINE", "json")
+ENGINE = None
+DURABILITY = getenv("STORE_DURABILITY", "sync")
+FLUSH_WRITES = int(getenv("STORE_FLUSH_WRITES", "100"))
+FLUSH_INTERVAL = int(getenv("STORE_FLUSH_MS", "50")) / 1000
 DATA = {}
+INDEXES = {}
+ORDERS = {}
+LOCKS = {}
+JOURNAL_SIZES = {}
+COMPACTING = set()
+PENDING = {}
+FIELDS = {}
+TIMESTAMP_CACHES = {'created_at': '_created_at_json',
+                    'updated_at': '_updated_at_json'}
+
+
+def _lock(s_class: str) -> threading.RLock:
+    """ Return the write lock of a class store
+    """
+    return LOCKS.setdefault(s_class, threading.RLock())
+
+
+_flush_cond = threading.Condition()
+_flush_now = threading.Event()
+_dirty = {}
+_flusher = []
+
+
+def _flush_loop():
+    """ Flush dirty classes after FLUSH_WRITES writes or FLUSH_INTERVAL
+    """
+    while True:
+        with _flush_cond:
+            while not _dirty:
+                _flush_cond.wait()
+            if not _flush_now.is_set():
+                _flush_cond.wait(FLUSH_INTERVAL)
+            _flush_now.clear()
+            classes = list(_dirty.values())
+            _dirty.clear()
+        for cls in classes:
+            cls.flush()
+
+
+def _mark_dirty(cls, pending: int):
+    """ Schedule a background flush of a class journal
+    """
+    with _flush_cond:
+        if not _flusher:
+            _flusher.append(threading.Thread(target=_flush_loop,
+                                             daemon=True))
+            _flusher[0].start()
+        if not _dirty or pending >= FLUSH_WRITES:
+            if pending >= FLUSH_WRITES:
+                _flush_now.set()
+            _flush_cond.notify()
+        _dirty[cls.__name__] = cls
+
+
+def flush_all():
+    """ Write every pending journal entry
+    """
+    for cls, _ in list(PENDING.values()):
+        cls.flush()
+
+
+def set_durability(mode: str):
+    """ Switch between "sync" and "batch" journal writes
+    """
+    global DURABILITY
+    if mode not in ("sync", "batch"):
+        raise ValueError("Unknown durability mode: {}".format(mode))
+    DURABILITY = mode
+    if mode == "sync":
+        flush_all()
+
+
+atexit.register(flush_all)
+
+
+def dumps_json(obj) -> str:
+    """ Encode JSON with orjson when installed, stdlib json otherwise
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+
+def loads_json(data):
+    """ Decode JSON with orjson when installed, stdlib json otherwise
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _fields(cls, for_serialization: bool = True) -> tuple:
+    """ Return the slot attribute names of a class, in declaration order
+    """
+    names = FIELDS.get((cls, for_serialization))
+    if names is None:
+        names = tuple(name for klass in reversed(cls.__mro__)
+                      for name in klass.__dict__.get('__slots__', ())
+                      if name not in ('__dict__', '__weakref__')
+                      and name not in TIMESTAMP_CACHES.values()
+                      and (for_serialization or name[0] != '_'))
+        FIELDS[(cls, for_serialization)] = names
+    return names
+
+
+def _index_add(indexes: dict, name: str, value, obj_id: str):
+    """ Add an id to a secondary index, replacing its insertion-ordered
+    dict of ids with a copy so readers never see it change
+    """
+    by_value = indexes.setdefault(name, {})
+    try:
+        ids = dict(by_value.get(value, ()))
+        ids[obj_id] = None
+        by_value[value] = ids
+    except TypeError:
+        pass
+
+
+def _changed_attributes(old, new) -> tuple:
+    """ Names of the indexed attributes to re-index when new replaces
+    old, leaving unchanged entries (and their order) alone
+    """
+    if old is None:
+        return new.indexed_attributes
+    if old is new:
+        return ()
+    return tuple(name for name in new.indexed_attributes
+                 if getattr(old, name, None) != getattr(new, name, None))
+
+
+def _index_discard(by_value: dict, value, obj_ids):
+    """ Remove ids from a secondary index entry, replacing it with a copy
+    """
+    try:
+        ids = by_value.get(value)
+    except TypeError:
+        return
+    if ids is None:
+        return
+    ids = {obj_id: None for obj_id in ids if obj_id not in obj_ids}
+    if ids:
+        by_value[value] = ids
+    else:
+        by_value.pop(value, None)
+
+
+class LazyStore(MutableMapping):
+    """ Objects of one class, parsed from a mmap'ed snapshot on first access
+    """
+
+    def __init__(self, cls, buffer, offsets: dict):
+        """ Initialize a store over line offsets (start, json start, end)
+        """
+        self._cls = cls
+        self._buffer = buffer
+        self._offsets = offsets
+        self._objects = {}
+        self._order = dict.fromkeys(offsets)
+        self._load_lock = threading.Lock()
+
+    def __getitem__(self, obj_id: str):
+        """ Return an object, materializing it if needed
+        """
+        obj = self._objects.get(obj_id)
+        if obj is not None:
+            return obj
+        with self._load_lock:
+            if obj_id in self._objects:
+                return self._objects[obj_id]
+            start, json_start, end = self._offsets[obj_id]
+            obj = self._cls(**loads_json(self._buffer[json_start:end]))
+            self._objects[obj_id] = obj
+            del self._offsets[obj_id]
+            return obj
+
+    def __setitem__(self, obj_id: str, obj):
+        """ Store an object
+        """
+        self._objects[obj_id] = obj
+        self._offsets.pop(obj_id, None)
+        self._order.setdefault(obj_id)
+
+    def __delitem__(self, obj_id: str):
+        """ Remove an object
+        """
+        del self._order[obj_id]
+        if obj_id in self._objects:
+            del self._objects[obj_id]
+            self._offsets.pop(obj_id, None)
+        else:
+            del self._offsets[obj_id]
+
+    def __contains__(self, obj_id) -> bool:
+        """ Membership without materializing
+        """
+        return obj_id in self._order
+
+    def __iter__(self):
+        """ Iterate over object ids in a stable order, whether or not
+        they are materialized
+        """
+        yield from list(self._order)
+
+    def __len__(self) -> int:
+        """ Number of objects
+        """
+        return len(self._order)
+
+    def values(self) -> list:
+        """ Snapshot of every object, skipping ones removed meanwhile
+        """
+        objs = []
+        for obj_id in self:
+            obj = self.get(obj_id)
+            if obj is not None:
+                objs.append(obj)
+        return objs
+
+    def loaded(self, obj_id: str):
+        """ Return an already materialized object, or None
+        """
+        return self._objects.get(obj_id)
+
+    def raw_line(self, obj_id: str):
+        """ Return the stored line of an object not yet materialized
+        """
+        offsets = self._offsets.get(obj_id)
+        if offsets is None:
+            return None
+        return self._buffer[offsets[0]:offsets[2] + 1]
+
+
+class IdOrder():
+    """ Storage order of the ids of one class, seekable from any id: an
+    append-only list with a position map, removals leaving holes until
+    the list is rebuilt
+    """
+
+    def __init__(self, ids: Iterable[str] = ()):
+        """ Initialize the order from ids in storage order
+        """
+        self._state = self._build(ids)
+
+    @staticmethod
+    def _build(ids: Iterable[str]) -> tuple:
+        """ Return a fresh id list and its position map
+        """
+        ids = list(ids)
+        return ids, {obj_id: i for i, obj_id in enumerate(ids)}
+
+    def add(self, obj_id: str):
+        """ Append a new id, keeping the position of a known one
+        """
+        ids, positions = self._state
+        if obj_id not in positions:
+            positions[obj_id] = len(ids)
+            ids.append(obj_id)
+
+    def discard(self, obj_id: str):
+        """ Forget an id, rebuilding once holes outnumber live ids
+        """
+        ids, positions = self._state
+        if positions.pop(obj_id, None) is not None and \
+                len(ids) > 2 * len(positions) + 64:
+            self._state = self._build(obj_id for obj_id in ids
+                                      if obj_id in positions)
+
+    def __contains__(self, obj_id) -> bool:
+        """ Membership
+        """
+        return obj_id in self._state[1]
+
+    def after(self, obj_id: str = None) -> Iterator[str]:
+        """ Yield ids stored after an id, or all of them, without copying
+        """
+        ids, positions = self._state
+        start = 0
+        if obj_id is not None:
+            start = positions.get(obj_id)
+            if start is None:
+                return
+            start += 1
+        for i in range(start, len(ids)):
+            obj_id = ids[i]
+            if positions.get(obj_id) == i:
+                yield obj_id
 
 
 class Base():
     """ Base class
     """
+    __slots__ = ('id', 'created_at', 'updated_at',
+                 '_created_at_json', '_updated_at_json')
+    indexed_attributes = ()
+    interned_attributes = ()
 
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
@@ -22,6 +331,7 @@ class Base():
         s_class = str(self.__class__.__name__)
         if DATA.get(s_class) is None:
             DATA[s_class] = {}
+            ORDERS[s_class] = IdOrder()
 
         self.id = kwargs.get('id', str(uuid.uuid4()))
         if kwargs.get('created_at') is not None:
@@ -35,6 +345,50 @@ class Base():
         else:
             self.updated_at = datetime.utcnow()
 
+    def __setattr__(self, name: str, value):
+        """ Set an attribute, keeping secondary indexes current
+        """
+        if type(value) is str and name in self.interned_attributes:
+            value = sys.intern(value)
+        cache = TIMESTAMP_CACHES.get(name)
+        if cache is not None:
+            super().__setattr__(cache, value.strftime(TIMESTAMP_FORMAT)
+                                if type(value) is datetime else None)
+        if name in self.indexed_attributes and self._is_stored() and \
+                getattr(self, name, None) != value:
+            with _lock(self.__class__.__name__):
+                self._unindex(name)
+                super().__setattr__(name, value)
+                self._index(name)
+        else:
+            super().__setattr__(name, value)
+
+    def _is_stored(self) -> bool:
+        """ Whether this instance is the one held in DATA
+        """
+        objs = DATA.get(self.__class__.__name__, {})
+        obj_id = getattr(self, 'id', None)
+        if isinstance(objs, LazyStore):
+            return objs.loaded(obj_id) is self
+        return objs.get(obj_id) is self
+
+    def _index(self, *names: str, indexes: dict = None):
+        """ Add this object to the indexes of its attributes
+        """
+        if indexes is None:
+            indexes = INDEXES.setdefault(self.__class__.__name__, {})
+        for name in names or self.indexed_attributes:
+            _index_add(indexes, name, getattr(self, name, None), self.id)
+
+    def _unindex(self, *names: str, indexes: dict = None):
+        """ Remove this object from the indexes of its attributes
+        """
+        if indexes is None:
+            indexes = INDEXES.get(self.__class__.__name__, {})
+        for name in names or self.indexed_attributes:
+            _index_discard(indexes.get(name, {}), getattr(self, name, None),
+                           (self.id,))
+
     def __eq__(self, other: TypeVar('Base')) -> bool:
         """ Equality
         """
@@ -48,7 +402,20 @@ class Base():
         """ Convert the object a JSON dictionary
         """
         result = {}
-        for key, value in self.__dict__.items():
+        for key in _fields(type(self), for_serialization):
+            cache = TIMESTAMP_CACHES.get(key)
+            if cache is not None and getattr(self, cache, None) is not None:
+                result[key] = getattr(self, cache)
+                continue
+            try:
+                value = getattr(self, key)
+            except AttributeError:
+                continue
+            if type(value) is datetime:
+                result[key] = value.strftime(TIMESTAMP_FORMAT)
+            else:
+                result[key] = value
+        for key, value in getattr(self, '__dict__', {}).items():
             if not for_serialization and key[0] == '_':
                 continue
             if type(value) is datetime:
@@ -57,56 +424,253 @@ class Base():
                 result[key] = value
         return result
 
+    @classmethod
+    def _snapshot_line(cls, obj) -> bytes:
+        """ Encode one object as an id/index header and its JSON
+        """
+        header = [obj.id, {name: getattr(obj, name, None)
+                           for name in cls.indexed_attributes}]
+        return (dumps_json(header) + "\t" +
+                dumps_json(obj.to_json(True)) + "\n").encode('utf-8')
+
+    @classmethod
+    def _load_lines(cls, file_path: str, indexes: dict) -> LazyStore:
+        """ Build the offset index and secondary indexes of a snapshot
+        """
+        offsets = {}
+        with open(file_path, 'rb') as f:
+            if path.getsize(file_path) == 0:
+                return LazyStore(cls, b"", offsets)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        pos = 0
+        size = len(buffer)
+        while pos < size:
+            end = buffer.find(b"\n", pos)
+            if end == -1:
+                end = size
+            tab = buffer.find(b"\t", pos, end)
+            if tab != -1:
+                obj_id, attributes = loads_json(buffer[pos:tab])
+                offsets[obj_id] = (pos, tab + 1, end)
+                for name, value in attributes.items():
+                    _index_add(indexes, name, value, obj_id)
+            pos = end + 1
+        return LazyStore(cls, buffer, offsets)
+
     @classmethod
     def load_from_file(cls):
-        """ Load all objects from file
+        """ Load all objects from snapshot file and replay the journal
         """
+        if ENGINE is not None:
+            return
         s_class = cls.__name__
         file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
-            return
-
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+        lines_path = ".db_{}.jsonl".format(s_class)
+        journal_path = ".db_{}.journal".format(s_class)
+        with _lock(s_class):
+            cls.flush()
+            indexes = {}
+            if path.exists(lines_path):
+                objs = cls._load_lines(lines_path, indexes)
+            else:
+                objs = {}
+                if path.exists(file_path):
+                    with open(file_path, 'r') as f:
+                        objs_json = loads_json(f.read())
+                        for obj_id, obj_json in objs_json.items():
+                            objs[obj_id] = cls(**obj_json)
+                            objs[obj_id]._index(indexes=indexes)
+            JOURNAL_SIZES[s_class] = 0
+            if path.exists(journal_path):
+                with open(journal_path, 'r+b') as f:
+                    good = 0
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        if not line.strip():
+                            good += len(line)
+                            continue
+                        try:
+                            entry = loads_json(line)
+                        except ValueError:
+                            break
+                        good += len(line)
+                        old = objs.get(entry['id'])
+                        if entry['op'] == 'put':
+                            obj = cls(**entry['obj'])
+                            changed = _changed_attributes(old, obj)
+                            if old is not None and changed:
+                                old._unindex(*changed, indexes=indexes)
+                            objs[entry['id']] = obj
+                            if changed:
+                                obj._index(*changed, indexes=indexes)
+                        elif old is not None:
+                            old._unindex(indexes=indexes)
+                            del objs[entry['id']]
+                        JOURNAL_SIZES[s_class] += 1
+                    # Drop a torn tail so later appends stay readable
+                    f.truncate(good)
+            INDEXES[s_class] = indexes
+            ORDERS[s_class] = IdOrder(objs)
+            DATA[s_class] = objs
 
     @classmethod
     def save_to_file(cls):
-        """ Save all objects to file
+        """ Save all objects to the snapshot file and reset the journal
         """
+        if ENGINE is not None:
+            return
         s_class = cls.__name__
         file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
+        lines_path = ".db_{}.jsonl".format(s_class)
+        journal_path = ".db_{}.journal".format(s_class)
+        with _lock(s_class):
+            objs = DATA[s_class]
+            if LOAD_MODE == 'lazy':
+                target, other = lines_path, file_path
+                with open(target + '.tmp', 'wb') as f:
+                    for obj_id in objs:
+                        raw = None
+                        if isinstance(objs, LazyStore):
+                            raw = objs.raw_line(obj_id)
+                        f.write(raw or cls._snapshot_line(objs[obj_id]))
+            else:
+                target, other = file_path, lines_path
+                objs_json = {}
+                for obj_id, obj in objs.items():
+                    objs_json[obj_id] = obj.to_json(True)
+                with open(target + '.tmp', 'w') as f:
+                    f.write(dumps_json(objs_json))
+            os.replace(target + '.tmp', target)
+            if path.exists(other):
+                os.remove(other)
+            open(journal_path, 'w').close()
+            JOURNAL_SIZES[s_class] = 0
+            PENDING.pop(s_class, None)
 
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+    @classmethod
+    def _compact(cls):
+        """ Fold the journal into the snapshot file
+        """
+        try:
+            cls.save_to_file()
+        finally:
+            COMPACTING.discard(cls.__name__)
+
+    @classmethod
+    def flush(cls):
+        """ Write pending journal entries of this class
+        """
+        s_class = cls.__name__
+        with _lock(s_class):
+            _, entries = PENDING.pop(s_class, (cls, []))
+            if entries:
+                cls._write_journal(entries)
+
+    @classmethod
+    def _append_journal(cls, *new_entries: dict):
+        """ Append upserts or deletes to the journal, or queue them
+        """
+        if DURABILITY != "batch":
+            cls._write_journal(list(new_entries))
+            return
+        _, entries = PENDING.setdefault(cls.__name__, (cls, []))
+        entries.extend(new_entries)
+        _mark_dirty(cls, len(entries))
+
+    @classmethod
+    def _write_journal(cls, entries: List[dict]):
+        """ Append entries to the journal in a single write
+        """
+        s_class = cls.__name__
+        journal_path = ".db_{}.journal".format(s_class)
+        with open(journal_path, 'a') as f:
+            f.write("".join(dumps_json(entry) + "\n" for entry in entries))
+        JOURNAL_SIZES[s_class] = JOURNAL_SIZES.get(s_class, 0) + len(entries)
+        threshold = max(JOURNAL_COMPACT_MIN, len(DATA.get(s_class, ())))
+        if JOURNAL_SIZES[s_class] > threshold and s_class not in COMPACTING:
+            COMPACTING.add(s_class)
+            threading.Thread(target=cls._compact, daemon=True).start()
 
     def save(self):
         """ Save current object
         """
         s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        if ENGINE is not None:
+            ENGINE.save(self)
+            return
+        with _lock(s_class):
+            old = DATA[s_class].get(self.id)
+            changed = _changed_attributes(old, self)
+            if old is not None and changed:
+                old._unindex(*changed)
+            DATA[s_class][self.id] = self
+            ORDERS[s_class].add(self.id)
+            if changed:
+                self._index(*changed)
+            self.__class__._append_journal({'op': 'put', 'id': self.id,
+                                            'obj': self.to_json(True)})
 
     def remove(self):
         """ Remove object
         """
+        if ENGINE is not None:
+            ENGINE.remove(self)
+            return
         s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        with _lock(s_class):
+            old = DATA[s_class].get(self.id)
+            if old is not None:
+                old._unindex()
+                del DATA[s_class][self.id]
+                ORDERS[s_class].discard(self.id)
+                self.__class__._append_journal({'op': 'del',
+                                                'id': self.id})
+
+    @classmethod
+    def remove_all(cls, objs: Iterable[TypeVar('Base')]) -> int:
+        """ Remove several objects with one journal write and one
+        update per index entry, returning how many were removed
+        """
+        if ENGINE is not None:
+            return ENGINE.remove_all(cls, list(objs))
+        s_class = cls.__name__
+        with _lock(s_class):
+            removed = {}
+            for obj in objs:
+                old = DATA[s_class].get(obj.id)
+                if old is not None:
+                    removed[obj.id] = old
+            if not removed:
+                return 0
+            indexes = INDEXES.get(s_class, {})
+            for name in cls.indexed_attributes:
+                by_value = indexes.get(name, {})
+                gone = {}
+                for obj_id, old in removed.items():
+                    try:
+                        gone.setdefault(getattr(old, name, None),
+                                        set()).add(obj_id)
+                    except TypeError:
+                        continue
+                for value, ids in gone.items():
+                    _index_discard(by_value, value, ids)
+            for obj_id in removed:
+                del DATA[s_class][obj_id]
+                ORDERS[s_class].discard(obj_id)
+            cls._append_journal(*({'op': 'del', 'id': obj_id}
+                                  for obj_id in removed))
+        return len(removed)
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
+        if ENGINE is not None:
+            return ENGINE.count(cls)
         s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return len(DATA.get(s_class, {}))
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
@@ -114,17 +678,55 @@ class Base():
         """
         return cls.search()
 
+    @classmethod
+    def iter_all(cls, after: str = None) -> Iterator[TypeVar('Base')]:
+        """ Iterate over all objects without building a list of them,
+        starting past the object with ID after when given
+        """
+        if after is None:
+            return cls._iter_search({})
+        if ENGINE is not None:
+            return ENGINE.iter_after(cls, after)
+        return cls._iter_after(after)
+
+    @classmethod
+    def _iter_after(cls, after: str) -> Iterator[TypeVar('Base')]:
+        """ Yield objects stored after an ID, seeking straight to it in
+        the storage order
+        """
+        s_class = cls.__name__
+        objs = DATA.get(s_class, {})
+        for obj_id in ORDERS.get(s_class, IdOrder()).after(after):
+            obj = objs.get(obj_id)
+            if obj is not None:
+                yield obj
+
     @classmethod
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
+        if ENGINE is not None:
+            return ENGINE.get(cls, id)
         s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return DATA.get(s_class, {}).get(id)
 
     @classmethod
-    def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
+    def search(cls, attributes: dict = {},
+               limit: int = None) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
+        return list(islice(cls._iter_search(attributes), limit))
+
+    @classmethod
+    def find_one(cls, attributes: dict = {}) -> TypeVar('Base'):
+        """ Return the first object with matching attributes
+        """
+        return next(cls._iter_search(attributes), None)
+
+    @classmethod
+    def _iter_search(cls, attributes: dict) -> Iterator[TypeVar('Base')]:
+        """ Yield objects with matching attributes, over a snapshot of ids
+        """
         s_class = cls.__name__
         def _search(obj):
             if len(attributes) == 0:
@@ -133,5 +735,29 @@ class Base():
                 if (getattr(obj, k) != v):
                     return False
             return True
-        
-        return list(filter(_search, DATA[s_class].values()))
+
+        if ENGINE is not None:
+            yield from ENGINE.iter_search(cls, attributes)
+            return
+        objs = DATA.get(s_class, {})
+        ids = None
+        for k in cls.indexed_attributes:
+            if k not in attributes:
+                continue
+            try:
+                ids = INDEXES.get(s_class, {}).get(k, {}).get(attributes[k],
+                                                              ())
+            except TypeError:
+                pass
+            break
+        if ids is None:
+            ids = ORDERS.get(s_class, IdOrder()).after()
+        for obj_id in ids:
+            obj = objs.get(obj_id)
+            if obj is not None and _search(obj):
+                yield obj
+
+
+if STORE_ENGINE == "sqlite":
+    from models.sqlite_engine import SQLiteEngine
+    ENGINE = SQLiteEngine()
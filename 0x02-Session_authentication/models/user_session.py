@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+""" UserSession module
+"""
+from models.base import Base
+
+
+class UserSession(Base):
+    """ UserSession class
+    """
+    __slots__ = ('user_id', 'session_id', 'expires_at')
+    indexed_attributes = ('session_id',)
+
+    def __init__(self, *args: list, **kwargs: dict):
+        """ Initialize a UserSession instance
+        """
+        super().__init__(*args, **kwargs)
+        self.user_id = kwargs.get('user_id')
+        self.session_id = kwargs.get('session_id')
+        self.expires_at = kwargs.get('expires_at')
@@ -2,11 +2,24 @@
 """Flask app module"""
 from flask import Flask, request, jsonify, abort, redirect
 from auth import Auth
+from hasher import HashingBusy
 
 app = Flask(__name__)
 AUTH = Auth()
 
 
+@app.teardown_appcontext
+def close_db_session(exception=None) -> None:
+    """Release request database session"""
+    AUTH.close_session()
+
+
+@app.errorhandler(HashingBusy)
+def hashing_busy(error) -> str:
+    """Service overloaded response"""
+    return jsonify({"message": "service busy"}), 503
+
+
 @app.route("/", methods=["GET"], strict_slashes=False)
 def welcome_message() -> str:
     """Welcome JSON response"""
@@ -1,19 +1,32 @@
 #!/usr/bin/env python3
 """Auth module definition"""
-import bcrypt
+import os
 from uuid import uuid4
 from sqlalchemy.orm.exc import NoResultFound
-from typing import TypeVar, Union
+from typing import NamedTuple, Union
+from cache import SessionCache
 from db import DB
+from hasher import HashingService
 from user import User
 
-UserType = TypeVar('UserType', bound=User)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "300"))
+
+HASHER = HashingService()
+
+
+class SessionUser(NamedTuple):
+    """Identity resolved from a session id, the same whether it came
+    from the session cache or the database"""
+    id: int
+    email: str
+    session_id: str
 
 
 def _encrypt_password(pwd: str) -> bytes:
     """Hash user password"""
     encoded_pwd = pwd.encode('utf-8')
-    return bcrypt.hashpw(encoded_pwd, bcrypt.gensalt())
+    return HASHER.hash(encoded_pwd)
 
 
 def _create_uuid() -> str:
@@ -26,6 +39,12 @@ class Auth:
 
     def __init__(self) -> None:
         self._db = DB()
+        self.session_cache = SessionCache(SESSION_CACHE_SIZE,
+                                          SESSION_CACHE_TTL)
+
+    def close_session(self) -> None:
+        """Release the current database session"""
+        self._db.remove_session()
 
     def register_user(self, email: str, password: str) -> User:
         """Register new user"""
@@ -46,7 +65,12 @@ class Auth:
 
         stored_password = user.hashed_password
         input_password = password.encode("utf-8")
-        return bcrypt.checkpw(input_password, stored_password)
+        if not HASHER.check(input_password, stored_password):
+            return False
+        if HASHER.needs_rehash(stored_password):
+            self._db.update_user(user.id,
+                                 hashed_password=_encrypt_password(password))
+        return True
 
     def create_session(self, email: str) -> Union[None, str]:
         """Create user session"""
@@ -57,20 +81,29 @@ class Auth:
 
         session_id = _create_uuid()
         self._db.update_user(user.id, session_id=session_id)
+        self.session_cache.invalidate_user(user.id)
+        self.session_cache.set(session_id, user.id, user.email)
         return session_id
 
-    def get_user_from_session_id(self, session_id: str) -> Union[None,
-                                                                 UserType]:
-        """Retrieve user by session"""
+    def get_user_from_session_id(
+            self, session_id: str) -> Union[None, SessionUser]:
+        """Retrieve the id and email of a session's user"""
         if session_id is None:
             return None
 
+        cached = self.session_cache.get(session_id)
+        if cached is not None:
+            user_id, email = cached
+            return SessionUser(user_id, email, session_id)
+
+        generation = self.session_cache.generation()
         try:
             user = self._db.find_user_by(session_id=session_id)
         except NoResultFound:
             return None
 
-        return user
+        self.session_cache.set(session_id, user.id, user.email, generation)
+        return SessionUser(user.id, user.email, session_id)
 
     def destroy_session(self, user_id: int) -> None:
         """Destroy user session"""
@@ -78,6 +111,8 @@ class Auth:
             self._db.update_user(user_id, session_id=None)
         except ValueError:
             return None
+        finally:
+            self.session_cache.invalidate_user(user_id)
         return None
 
     def get_reset_password_token(self, email: str) -> str:
@@ -101,3 +136,4 @@ class Auth:
         hashed_pwd = _encrypt_password(password)
         self._db.update_user(user.id, hashed_password=hashed_pwd,
                              reset_token=None)
+        self.session_cache.invalidate_user(user.id)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Session cache module"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple, Union
+
+
+class SessionCache:
+    """Bounded LRU/TTL cache of session_id -> (user id, email)"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300) -> None:
+        """Initialize cache instance"""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._generation = 0
+        self._invalidated_at = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, session_id: str) -> Union[None, Tuple[int, str]]:
+        """Return cached user id and email"""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, email, expires = entry
+            if expires < time.monotonic():
+                self._drop(session_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return user_id, email
+
+    def generation(self) -> int:
+        """Return the current invalidation generation"""
+        with self._lock:
+            return self._generation
+
+    def set(self, session_id: str, user_id: int, email: str,
+            generation: int = None) -> None:
+        """Cache a session, unless the user was invalidated after
+        the given generation was read"""
+        with self._lock:
+            if generation is not None and \
+                    self._invalidated_at.get(user_id, -1) > generation:
+                return
+            old_session = self._by_user.get(user_id)
+            if old_session is not None and old_session != session_id:
+                self._drop(old_session)
+            self._entries[session_id] = (user_id, email,
+                                         time.monotonic() + self.ttl)
+            self._entries.move_to_end(session_id)
+            self._by_user[user_id] = session_id
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop any cached session of a user"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at[user_id] = self._generation
+            self._invalidated_at.move_to_end(user_id)
+            while len(self._invalidated_at) > self.max_size:
+                self._invalidated_at.popitem(last=False)
+            session_id = self._by_user.get(user_id)
+            if session_id is not None:
+                self._drop(session_id)
+
+    def _drop(self, session_id: str) -> None:
+        """Remove an entry, lock must be held"""
+        entry = self._entries.pop(session_id, None)
+        if entry is not None and self._by_user.get(entry[0]) == session_id:
+            del self._by_user[entry[0]]
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
@@ -1,30 +1,87 @@
 #!/usr/bin/env python3
 """Database module"""
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, text, Table, Column, Index, Integer
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm.session import Session
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.exc import InvalidRequestError
 from user import Base, User
 
+DB_URL = os.getenv("USER_AUTH_DB_URL", "sqlite:///a.db")
+DB_RESET = os.getenv("USER_AUTH_DB_RESET", "1") == "1"
+POOL_SIZE = int(os.getenv("USER_AUTH_DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("USER_AUTH_DB_MAX_OVERFLOW", "10"))
+POOL_RECYCLE = int(os.getenv("USER_AUTH_DB_POOL_RECYCLE", "-1"))
+POOL_PRE_PING = os.getenv("USER_AUTH_DB_POOL_PRE_PING", "1") == "1"
+
+schema_version = Table("schema_version", Base.metadata,
+                       Column("version", Integer, primary_key=True))
+
+
+def _users_index(column: str) -> Index:
+    """Return the index the User model declares on a column"""
+    name = f"ix_users_{column}"
+    return next(index for index in User.__table__.indexes
+                if index.name == name)
+
+
+# Additive migrations, applied in order on top of the base schema. They
+# hold SQLAlchemy schema items so the DDL suits any configured database
+MIGRATIONS = [
+    (1, []),
+    (2, [_users_index("email"), _users_index("session_id"),
+         _users_index("reset_token")]),
+]
+
+
+def _create_engine(url: str):
+    """Create a pooled engine"""
+    kwargs = {"pool_size": POOL_SIZE, "max_overflow": POOL_MAX_OVERFLOW,
+              "pool_recycle": POOL_RECYCLE, "pool_pre_ping": POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        kwargs["poolclass"] = QueuePool
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return create_engine(url, echo=False, **kwargs)
+
 
 class DB:
     """Database class implementation"""
-    def __init__(self) -> None:
+    def __init__(self, url: str = None, reset: bool = None) -> None:
         """Initialize database instance"""
-        self._engine = create_engine("sqlite:///a.db", echo=False)
-        Base.metadata.drop_all(self._engine)
+        self._engine = _create_engine(url or DB_URL)
+        if reset is None:
+            reset = DB_RESET
+        if reset:
+            Base.metadata.drop_all(self._engine)
         Base.metadata.create_all(self._engine)
-        self.__session = None
+        self._migrate()
+        self.__session = scoped_session(sessionmaker(bind=self._engine))
+
+    def _migrate(self) -> None:
+        """Apply missing schema migrations"""
+        with self._engine.begin() as conn:
+            current = conn.execute(
+                text("SELECT MAX(version) FROM schema_version")).scalar()
+            for version, items in MIGRATIONS:
+                if current is not None and version <= current:
+                    continue
+                for item in items:
+                    item.create(conn, checkfirst=True)
+                conn.execute(
+                    text("INSERT INTO schema_version (version) VALUES (:v)"),
+                    {"v": version})
 
     @property
     def _session(self) -> Session:
-        """Memoized session object"""
-        if self.__session is None:
-            DBSession = sessionmaker(bind=self._engine)
-            self.__session = DBSession()
-        return self.__session
+        """Thread-scoped session object"""
+        return self.__session()
+
+    def remove_session(self) -> None:
+        """Close the current thread session"""
+        self.__session.remove()
 
     def add_user(self, email: str, hashed_password: str) -> User:
         """Add user to database"""
@@ -35,14 +92,15 @@ class DB:
 
     def find_user_by(self, **kwargs) -> User:
         """Find user by attributes"""
-        all_users = self._session.query(User)
-        for key, value in kwargs.items():
+        if not kwargs:
+            raise InvalidRequestError
+        for key in kwargs:
             if key not in User.__dict__:
                 raise InvalidRequestError
-            for user in all_users:
-                if getattr(user, key) == value:
-                    return user
-        raise NoResultFound
+        user = self._session.query(User).filter_by(**kwargs).first()
+        if user is None:
+            raise NoResultFound
+        return user
 
     def update_user(self, user_id: int, **kwargs) -> None:
         """Update user attributes"""
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Password hashing service module"""
+import bcrypt
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "64"))
+HASH_TIMEOUT = float(os.getenv("HASH_TIMEOUT", "10"))
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS", "12")
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+
+def calibrate_rounds(target_ms: float = BCRYPT_TARGET_MS) -> int:
+    """Pick the highest cost whose hash time fits the target"""
+    rounds = BCRYPT_MIN_ROUNDS
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds))
+    elapsed = (time.perf_counter() - start) * 1000
+    while rounds < BCRYPT_MAX_ROUNDS and elapsed * 2 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    return rounds
+
+
+def hash_rounds(hashed_password: bytes) -> int:
+    """Return the cost factor of a bcrypt hash"""
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode("utf-8")
+    return int(hashed_password.split(b"$")[2])
+
+
+class HashingBusy(RuntimeError):
+    """Raised when the hashing queue is full or a job times out"""
+
+
+class HashingService:
+    """Bounded worker pool for bcrypt hashing"""
+
+    def __init__(self, workers: int = HASH_WORKERS,
+                 queue_size: int = HASH_QUEUE_SIZE,
+                 timeout: float = HASH_TIMEOUT,
+                 rounds: str = BCRYPT_ROUNDS) -> None:
+        """Initialize hashing service"""
+        self.timeout = timeout
+        if rounds == "auto":
+            self.rounds = calibrate_rounds()
+        else:
+            self.rounds = int(rounds)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _run(self, func: Callable, *args):
+        """Run a job on the pool and wait for its result"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingBusy("hashing queue is full")
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy("hashing timed out")
+
+    def gensalt(self) -> bytes:
+        """Generate a salt at the configured cost"""
+        return bcrypt.gensalt(self.rounds)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """Whether a hash is below the configured cost"""
+        return hash_rounds(hashed_password) < self.rounds
+
+    def hash(self, password: bytes, salt: bytes = None) -> bytes:
+        """Hash password on the pool"""
+        if salt is None:
+            salt = self.gensalt()
+        return self._run(bcrypt.hashpw, password, salt)
+
+    def check(self, password: bytes, hashed_password: bytes) -> bool:
+        """Check password on the pool"""
+        return self._run(bcrypt.checkpw, password, hashed_password)
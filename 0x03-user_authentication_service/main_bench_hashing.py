@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark of login password checks per second through the hashing
+pool, by number of pool workers (one per core by default)
+"""
+import os
+import threading
+import time
+from hasher import HashingBusy, HashingService
+
+WORKERS = [int(count) for count in os.getenv(
+    "BENCH_WORKERS",
+    ",".join(str(2 ** i) for i in range(8)
+             if 2 ** i <= (os.cpu_count() or 1))).split(",")]
+CALLERS = int(os.getenv("BENCH_CALLERS", "32"))
+DURATION = float(os.getenv("BENCH_SECONDS", "5"))
+PASSWORD = b"bench-password"
+
+
+def run(workers: int) -> tuple:
+    """Return checks per second and busy rejections over DURATION"""
+    hasher = HashingService(workers=workers, queue_size=CALLERS)
+    hashed = hasher.hash(PASSWORD)
+    counts = [0] * CALLERS
+    busy = [0] * CALLERS
+    deadline = time.perf_counter() + DURATION
+
+    def caller(i: int) -> None:
+        """Check the password until the deadline, like login requests"""
+        while time.perf_counter() < deadline:
+            try:
+                assert hasher.check(PASSWORD, hashed)
+                counts[i] += 1
+            except HashingBusy:
+                busy[i] += 1
+
+    callers = [threading.Thread(target=caller, args=(i,))
+               for i in range(CALLERS)]
+    start = time.perf_counter()
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return hasher.rounds, sum(counts) / elapsed, sum(busy)
+
+
+def main() -> None:
+    """Report check throughput for each pool size"""
+    print(f"cpus: {os.cpu_count()}, callers: {CALLERS}")
+    print(f"{'workers':>7} {'rounds':>6} {'checks/s':>9} {'busy':>5}")
+    for workers in WORKERS:
+        rounds, rate, busy = run(workers)
+        print(f"{workers:>7} {rounds:>6} {rate:>9.1f} {busy:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Load test of /sessions and /profile throughput by client thread
+count, against a running app (python3 app.py)
+"""
+import os
+import threading
+import time
+import requests
+
+BASE_URL = os.getenv("BENCH_URL", "http://127.0.0.1:5000")
+THREADS = [int(count) for count in
+           os.getenv("BENCH_THREADS", "1,2,4,8,16").split(",")]
+DURATION = float(os.getenv("BENCH_SECONDS", "5"))
+EMAIL = "bench{}@load.test"
+PASSWORD = "bench-password"
+
+
+def login(client: requests.Session, i: int) -> bool:
+    """Log bench user i in, keeping its session_id cookie"""
+    res = client.post(f"{BASE_URL}/sessions",
+                      data={"email": EMAIL.format(i), "password": PASSWORD})
+    return res.status_code == 200
+
+
+def hit_profile(client: requests.Session, i: int) -> bool:
+    """Fetch the profile of bench user i"""
+    return client.get(f"{BASE_URL}/profile").status_code == 200
+
+
+def run(endpoint, threads: int) -> tuple:
+    """Return requests per second and failures over DURATION"""
+    clients = [requests.Session() for _ in range(threads)]
+    for i, client in enumerate(clients):
+        assert login(client, i), "login failed"
+    counts = [0] * threads
+    failures = [0] * threads
+    deadline = time.perf_counter() + DURATION
+
+    def worker(i: int) -> None:
+        """Send requests until the deadline"""
+        while time.perf_counter() < deadline:
+            if endpoint(clients[i], i):
+                counts[i] += 1
+            else:
+                failures[i] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed, sum(failures)
+
+
+def main() -> None:
+    """Register one bench user per thread and report throughput per
+    thread count"""
+    for i in range(max(THREADS)):
+        requests.post(f"{BASE_URL}/users",
+                      data={"email": EMAIL.format(i), "password": PASSWORD})
+    print(f"{'threads':>7} {'/sessions req/s':>16} {'/profile req/s':>15} "
+          f"{'failures':>9}")
+    for threads in THREADS:
+        sessions_rate, sessions_failed = run(login, threads)
+        profile_rate, profile_failed = run(hit_profile, threads)
+        print(f"{threads:>7} {sessions_rate:>16.1f} {profile_rate:>15.1f} "
+              f"{sessions_failed + profile_failed:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark of DB.find_user_by latency as the users table grows.
+Run it from this directory, it works on a SQLite file in a temporary
+directory.
+"""
+import os
+import random
+import tempfile
+import time
+from db import DB
+from user import User
+
+SIZES = [int(size) for size in
+         os.getenv("BENCH_SIZES", "1000,10000,100000,1000000").split(",")]
+LOOKUPS = int(os.getenv("BENCH_LOOKUPS", "2000"))
+INSERT_CHUNK = 10000
+
+
+def grow(db: DB, start: int, stop: int) -> None:
+    """Insert users start..stop-1 in bulk"""
+    with db._engine.begin() as conn:
+        for first in range(start, stop, INSERT_CHUNK):
+            last = min(first + INSERT_CHUNK, stop)
+            conn.execute(User.__table__.insert(), [
+                {"email": f"user{i}@bench", "hashed_password": "x",
+                 "session_id": f"session-{i}"} for i in range(first, last)])
+
+
+def measure(db: DB, size: int, key: str) -> tuple:
+    """Return mean and p99 lookup latency in microseconds"""
+    timings = []
+    for _ in range(LOOKUPS):
+        i = random.randrange(size)
+        value = f"user{i}@bench" if key == "email" else f"session-{i}"
+        start = time.perf_counter()
+        db.find_user_by(**{key: value})
+        timings.append((time.perf_counter() - start) * 1e6)
+        db._session.expunge_all()
+    timings.sort()
+    return (sum(timings) / len(timings),
+            timings[int(len(timings) * 0.99) - 1])
+
+
+def main() -> None:
+    """Grow the table through each size and time lookups at each step"""
+    os.chdir(tempfile.mkdtemp(prefix="bench_lookup_"))
+    db = DB("sqlite:///bench.db", reset=True)
+    print(f"{'users':>9} {'email mean':>11} {'email p99':>10} "
+          f"{'session mean':>13} {'session p99':>12}  (us)")
+    rows = 0
+    for size in SIZES:
+        grow(db, rows, size)
+        rows = size
+        email_mean, email_p99 = measure(db, size, "email")
+        session_mean, session_p99 = measure(db, size, "session_id")
+        print(f"{size:>9} {email_mean:>11.1f} {email_p99:>10.1f} "
+              f"{session_mean:>13.1f} {session_p99:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()